@@ -1,7 +1,7 @@
 """
 voice_assistant.py
 A simple voice-activated AI chatbot with:
-- speech -> text (SpeechRecognition)
+- speech -> text (SpeechRecognition capture + local faster-whisper)
 - text -> speech (pyttsx3)
 - wikipedia lookup (wikipedia-api)
 - open websites / google search
@@ -11,7 +11,7 @@ A simple voice-activated AI chatbot with:
 """
 
 import speech_recognition as sr
-import pyttsx3
+import numpy as np
 import datetime
 import time
 import webbrowser
@@ -19,88 +19,437 @@ import os
 import subprocess
 import platform
 import threading
-import json
-import wikipediaapi
+import queue
+import orjson
+import asyncio
+import hashlib
+import functools
+import collections
+import shelve
+import heapq
+import atexit
+import contextlib
+import re
 from urllib.parse import quote_plus
+from faster_whisper import WhisperModel
 
-# Optional import for camera
+# Optional import for cached prompt playback
 try:
-    import cv2
+    import simpleaudio
 except Exception:
-    cv2 = None
+    simpleaudio = None
+
+# Optional import for spelled-out reminder times ("five minutes")
+try:
+    from word2number import w2n
+except Exception:
+    w2n = None
+
+# Optional import for non-blocking note writes
+try:
+    import aiofiles
+except Exception:
+    aiofiles = None
 
 # --- Text-to-speech setup ---
-engine = pyttsx3.init()
-engine.setProperty('rate', 150)        # speaking rate (words per minute)
-voices = engine.getProperty('voices')
-if voices:
-    engine.setProperty('voice', voices[0].id)  # pick voice index 0 (change if needed)
+TTS_RATE = 150          # speaking rate (words per minute)
+TTS_VOICE_INDEX = 0     # pick voice index 0 (change if needed)
+
+@functools.cache
+def _get_engine():
+    """Initialize pyttsx3 on first use rather than at import."""
+    import pyttsx3
+    engine = pyttsx3.init()
+    engine.setProperty('rate', TTS_RATE)
+    voices = engine.getProperty('voices')
+    if voices:
+        engine.setProperty('voice', voices[TTS_VOICE_INDEX].id)
+    return engine
+
+# Held by the speaker thread while playing and by the microphone while
+# capturing, so the assistant never hears itself.
+_audio_lock = threading.Lock()
+
+# (job, done_event) pairs run in order by the speaker thread, which owns the
+# pyttsx3 engine; done_event is None for fire-and-forget speech.
+_SAY_Q = queue.Queue()
+
+# Bumped after each speaker job so the microphone knows to drop what it
+# buffered meanwhile (our own speech) instead of flushing on every poll.
+_spoken_count = 0
+
+def _speaker_loop():
+    global _spoken_count
+    while True:
+        job, done = _SAY_Q.get()
+        try:
+            with _audio_lock:
+                try:
+                    job()
+                finally:
+                    _spoken_count += 1
+        except Exception as e:
+            print("Speech error:", str(e))
+        finally:
+            if done is not None:
+                done.set()
+            _SAY_Q.task_done()
+
+threading.Thread(target=_speaker_loop, daemon=True).start()
+
+def _say(text: str):
+    engine = _get_engine()
+    engine.say(text)
+    engine.runAndWait()
 
 def speak(text: str):
-    """Speak the given text and print to console."""
+    """Queue the given text for speaking and print to console; returns at once."""
     print("[Assistant]:", text)
-    engine.say(text)
+    _SAY_Q.put((functools.partial(_say, text), None))
+
+async def speak_sync(text: str, cached: bool = False):
+    """Speak the given text and wait until it has finished playing."""
+    print("[Assistant]:", text)
+    done = threading.Event()
+    job = _play_cached if cached and simpleaudio is not None else _say
+    _SAY_Q.put((functools.partial(job, text), done))
+    await asyncio.to_thread(done.wait)
+
+# --- Cached prompts ---
+TTS_CACHE_DIR = "tts_cache"
+
+# Fixed prompts rendered once to disk and replayed by speak_cached().
+STATIC_PROMPTS = (
+    "Good morning!",
+    "Good afternoon!",
+    "Good evening!",
+    "Hello!",
+    "I am your voice assistant. How can I help you?",
+    "Listening for your command.",
+    "Sorry, I didn't understand that. Please say it again.",
+    "What should I search on Wikipedia?",
+    "Searching Wikipedia...",
+    "What should I search for?",
+    "What should I write in the note?",
+    "No content provided; note canceled.",
+    "Note saved.",
+    "Do you want me to open the notes file? Say yes or no.",
+    "What should I remind you about?",
+    "No message provided. Reminder canceled.",
+    "In how many minutes should I remind you?",
+    "I couldn't parse the time in minutes. Reminder canceled.",
+    "Do you really want to shutdown the computer? Say 'yes' to confirm.",
+    "Shutdown canceled.",
+    "Do you really want to restart the computer? Say 'yes' to confirm.",
+    "Restart canceled.",
+    "Goodbye. Have a nice day!",
+)
+
+@functools.cache
+def _voice_id() -> str:
+    """The engine's selected voice id, resolved once (on the speaker thread)."""
+    return str(_get_engine().getProperty('voice'))
+
+def _tts_cache_path(text: str) -> str:
+    # keyed on the actual voice id: index 0 can be a different voice after
+    # voices are installed/removed or the cache is copied to another machine
+    key = hashlib.sha256(f"{text}|{_voice_id()}|{TTS_RATE}".encode("utf-8")).hexdigest()
+    return os.path.join(TTS_CACHE_DIR, key + ".wav")
+
+def _render(text: str, path: str):
+    os.makedirs(TTS_CACHE_DIR, exist_ok=True)
+    tmp = path[:-len(".wav")] + ".part.wav"
+    engine = _get_engine()
+    engine.save_to_file(text, tmp)
     engine.runAndWait()
+    os.replace(tmp, path)  # never leave a half-written file under the real key
+
+# Set after the first render/load failure (e.g. a driver that writes AIFF, or
+# a corrupt file); retrying would synthesize twice per prompt, so the rest of
+# the process speaks live instead.
+_tts_cache_disabled = False
+
+def _disable_tts_cache(error):
+    global _tts_cache_disabled
+    _tts_cache_disabled = True
+    print("TTS cache error:", str(error))
+    print(f"Prompt caching disabled; clear {TTS_CACHE_DIR}/ if this persists.")
+
+def _load_cached(text: str):
+    path = _tts_cache_path(text)
+    if not os.path.exists(path):
+        _render(text, path)
+    return simpleaudio.WaveObject.from_wave_file(path)
+
+def _play_cached(text: str):
+    if not _tts_cache_disabled:
+        try:
+            wave_obj = _load_cached(text)
+        except Exception as e:
+            _disable_tts_cache(e)
+        else:
+            wave_obj.play().wait_done()
+            return
+    _say(text)
+
+def speak_cached(text: str):
+    """Like speak(), but replays a rendering of text cached on disk."""
+    if simpleaudio is None or _tts_cache_disabled:
+        speak(text)
+        return
+    print("[Assistant]:", text)
+    _SAY_Q.put((functools.partial(_play_cached, text), None))
+
+def prewarm_tts_cache():
+    """Render any STATIC_PROMPTS that are not cached yet and check they load."""
+    if simpleaudio is None:
+        return
+    for text in STATIC_PROMPTS:
+        if _tts_cache_disabled:
+            return
+        try:
+            _load_cached(text)
+        except Exception as e:
+            _disable_tts_cache(e)
 
 # --- Speech to text (microphone) ---
-def takeCommand(timeout: int = None, phrase_time_limit: int = 8) -> str:
+# Loaded once at import so the weights stay warm between utterances.
+whisper_model = WhisperModel("base.en", device="cpu", compute_type="int8")
+
+# Seconds to wait for speech to start before letting the speaker have its
+# turn. listen() holds _audio_lock for the whole call, so a reply queued while
+# the microphone is idle waits up to LISTEN_POLL before it plays; if noise (or
+# the user) starts a phrase, it waits until the phrase ends, at most
+# phrase_time_limit. Kept short because the stream stays open and re-polling
+# is cheap.
+LISTEN_POLL = 0.25
+
+# (capture_start, text) pairs, produced by listen_loop() and consumed by
+# takeCommand(); capture_start is a time.monotonic() value.
+# Created in main() so it belongs to the running event loop.
+utterances = None
+
+# Built once instead of per utterance; ambient noise is calibrated a single
+# time when the microphone is opened and the dynamic threshold follows drift
+# from there.
+_RECOGNIZER = sr.Recognizer()
+_RECOGNIZER.pause_threshold = 0.8          # seconds of pause before finishing a phrase
+_RECOGNIZER.energy_threshold = 300         # starting point; adapted by dynamic threshold
+_RECOGNIZER.dynamic_energy_threshold = True
+
+# The microphone stream is opened on first capture and then kept open:
+# entering sr.Microphone starts PortAudio and enumerates devices, which is
+# too slow to repeat on every LISTEN_POLL.
+_mic_stack = contextlib.ExitStack()
+_mic_source = None
+
+def _open_mic():
+    global _mic_source
+    if _mic_source is None:
+        source = _mic_stack.enter_context(sr.Microphone())
+        with _audio_lock:
+            _RECOGNIZER.adjust_for_ambient_noise(source, duration=0.6)
+        _mic_source = source
+    return _mic_source
+
+def _close_mic():
+    global _mic_source
+    _mic_source = None
+    _mic_stack.close()
+
+atexit.register(_close_mic)
+
+_flushed_at = 0  # _spoken_count when the mic buffer was last flushed
+
+def _capture(timeout, phrase_time_limit):
+    global _flushed_at
+    source = _open_mic()
+    with _audio_lock:
+        if _flushed_at != _spoken_count:
+            # drop audio buffered while the assistant was speaking
+            stream = source.stream.pyaudio_stream
+            pending = stream.get_read_available()
+            if pending:
+                stream.read(pending, exception_on_overflow=False)
+            _flushed_at = _spoken_count
+        return _RECOGNIZER.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+
+# Whisper punctuates its output ("Open YouTube, please.", "Albert Einstein.").
+# Everything but apostrophes and dots inside words ("example.com") becomes a
+# space, so commands and follow-up answers alike arrive as plain words.
+_PUNCT_RE = re.compile(r"[^\w\s'.]|\.(?!\w)")
+
+def _transcribe(audio) -> str:
+    # 16 kHz mono 16-bit PCM -> float32 in [-1, 1] as expected by Whisper
+    raw = audio.get_raw_data(convert_rate=16000, convert_width=2)
+    samples = np.frombuffer(raw, np.int16).astype(np.float32) / 32768.0
+    segments, _ = whisper_model.transcribe(samples, beam_size=1, vad_filter=True)
+    text = " ".join(seg.text for seg in segments)
+    return " ".join(_PUNCT_RE.sub(" ", text).split())
+
+async def listen_loop(phrase_time_limit: int = 8):
     """
-    Listen from the microphone and return recognized text.
-    Returns empty string on failure.
+    Producer: keep capturing utterances from the microphone and queue their
+    transcriptions. Capture waits for queued speech to finish playing;
+    transcription overlaps with replies and any network calls in flight.
+    Failed recognitions are queued as empty strings.
     """
-    r = sr.Recognizer()
-    r.pause_threshold = 0.8          # seconds of pause before finishing a phrase
-    r.energy_threshold = 300         # adjust if too quiet/too noisy
-    try:
-        with sr.Microphone() as source:
-            print("Listening...")
-            r.adjust_for_ambient_noise(source, duration=0.6)
-            audio = r.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+    print("Listening...")
+    while True:
+        try:
+            # let anything queued for the speaker play before listening again
+            if _SAY_Q.unfinished_tasks:
+                await asyncio.to_thread(_SAY_Q.join)
+            started = time.monotonic()
+            audio = await asyncio.to_thread(_capture, LISTEN_POLL, phrase_time_limit)
+        except sr.WaitTimeoutError:
+            continue
+        except Exception as e:
+            print("Microphone error:", str(e))
+            _close_mic()  # reopen the device on the next attempt
+            speak("Microphone not available. Check your microphone and permissions.")
+            await utterances.put((started, ""))
+            continue
         try:
-            query = r.recognize_google(audio, language='en-in')
+            query = await asyncio.to_thread(_transcribe, audio)
+        except Exception as e:
+            print("Speech recognition error:", str(e))
+            speak("Speech recognition failed. Please say it again.")
+            await utterances.put((started, ""))
+            continue
+        if not query:
+            speak_cached("Sorry, I didn't understand that. Please say it again.")
+        else:
             print("[You]:", query)
+        await utterances.put((started, query))
+
+async def _next_utterance(since):
+    while True:
+        started, query = await utterances.get()
+        if since is None or started >= since:
             return query
-        except sr.UnknownValueError:
-            speak("Sorry, I didn't understand that. Please say it again.")
-            return ""
-        except sr.RequestError:
-            speak("Network/API error. Check your internet connection.")
-            return ""
-    except Exception as e:
-        print("Microphone error:", str(e))
-        speak("Microphone not available. Check your microphone and permissions.")
+
+async def takeCommand(timeout: float = None, since: float = None) -> str:
+    """
+    Wait for the next recognized utterance and return its text.
+    timeout is how many seconds to wait for an utterance to be recognized
+    (including any prompt still playing), not a microphone setting; None
+    waits indefinitely.
+    If since (a time.monotonic() value) is given, utterances whose capture
+    started earlier are dropped as stale.
+    Returns empty string on failure or if nothing arrives within timeout.
+    """
+    try:
+        return await asyncio.wait_for(_next_utterance(since), timeout)
+    except asyncio.TimeoutError:
         return ""
 
+# Seconds to wait for a yes/no to a shutdown/restart confirmation; silence
+# cancels instead of leaving the question pending indefinitely.
+CONFIRM_TIMEOUT = 15
+
+async def ask(prompt: str, timeout: float = None) -> str:
+    """
+    Ask a follow-up question and return the answer ("" if none arrives within
+    timeout). Anything said before the question (e.g. during a slow lookup)
+    is discarded rather than being taken as the answer.
+    """
+    asked_at = time.monotonic()
+    speak_cached(prompt)
+    return await takeCommand(timeout=timeout, since=asked_at)
+
 # --- Greeting ---
-def wishMe():
+async def wishMe():
     hour = datetime.datetime.now().hour
     if 5 <= hour < 12:
-        speak("Good morning!")
+        speak_cached("Good morning!")
     elif 12 <= hour < 18:
-        speak("Good afternoon!")
+        speak_cached("Good afternoon!")
     elif 18 <= hour < 22:
-        speak("Good evening!")
+        speak_cached("Good evening!")
     else:
-        speak("Hello!")
-    speak("I am your voice assistant. How can I help you?")
+        speak_cached("Hello!")
+    speak_cached("I am your voice assistant. How can I help you?")
 
 # --- Wikipedia search ---
-wiki_wiki = wikipediaapi.Wikipedia(
-    language='en',
-    user_agent='VoiceAssistant/1.0 (https://github.com/vshashank; vakalapudi.shashank@example.com)'
-)
-
-
-def search_wikipedia(query: str, sentences: int = 2):
+@functools.cache
+def _get_wiki():
+    import wikipediaapi
+    return wikipediaapi.Wikipedia(
+        language='en',
+        user_agent='VoiceAssistant/1.0 (https://github.com/vshashank; vakalapudi.shashank@example.com)'
+    )
+
+WIKI_CACHE_FILE = "wiki_cache.db"
+WIKI_CACHE_TTL = 7 * 24 * 3600  # seconds
+WIKI_MEMORY_SIZE = 256
+_wiki_cache_lock = threading.Lock()  # guards shelve and _wiki_memory across threads
+_wiki_memory = collections.OrderedDict()  # topic -> (timestamp, summary), LRU order
+
+def _remember_summary(topic: str, entry):
+    with _wiki_cache_lock:
+        _wiki_memory[topic] = entry
+        _wiki_memory.move_to_end(topic)
+        if len(_wiki_memory) > WIKI_MEMORY_SIZE:
+            _wiki_memory.popitem(last=False)
+
+def _fetch_summary(topic: str):
+    """
+    Return the page summary for topic, or None if there is no such page.
+    topic should already be normalized (stripped, lower-case); summaries are
+    kept in memory and on disk for WIKI_CACHE_TTL so repeat lookups skip the
+    network. Misses are not cached.
+    """
+    with _wiki_cache_lock:
+        cached = _wiki_memory.get(topic)
+        if cached:
+            _wiki_memory.move_to_end(topic)
+    if cached and time.time() - cached[0] < WIKI_CACHE_TTL:
+        return cached[1]
+    try:
+        with _wiki_cache_lock, shelve.open(WIKI_CACHE_FILE) as db:
+            cached = db.get(topic)
+    except Exception as e:
+        # the disk cache is only an optimization (corrupt db, unwritable
+        # cwd, file from another dbm backend...): fall through to the network
+        print("Wikipedia cache error:", str(e))
+        cached = None
+    if cached and time.time() - cached[0] < WIKI_CACHE_TTL:
+        _remember_summary(topic, cached)
+        return cached[1]
+    page = _get_wiki().page(topic)
+    if not page.exists():
+        return None
+    summary = page.summary
+    entry = (time.time(), summary)
+    try:
+        with _wiki_cache_lock, shelve.open(WIKI_CACHE_FILE) as db:
+            db[topic] = entry
+    except Exception as e:
+        print("Wikipedia cache error:", str(e))
+    _remember_summary(topic, entry)
+    return summary
+
+def _head_sentences(s: str, n: int) -> str:
+    """Return s up to and including its n-th period (all of s if it has fewer)."""
+    i = -1
+    for _ in range(n):
+        j = s.find(".", i + 1)
+        if j < 0:
+            return s
+        i = j
+    return s[:i + 1]
+
+async def search_wikipedia(query: str, sentences: int = 2):
     topic = query.strip()
     if not topic:
-        speak("What should I search on Wikipedia?")
-        topic = takeCommand()
-    page = wiki_wiki.page(topic)
-    if page.exists():
-        summary = page.summary
+        topic = await ask("What should I search on Wikipedia?")
+    # speak() returns immediately, so the fetch runs while this is announced
+    speak_cached("Searching Wikipedia...")
+    summary = await asyncio.to_thread(_fetch_summary, topic.strip().lower())
+    if summary is not None:
         # speak only first few sentences
-        short = ". ".join(summary.split(".")[:sentences]).strip()
+        short = _head_sentences(summary, sentences).strip()
         if not short:
             short = summary[:500]
         speak(f"According to Wikipedia: {short}")
@@ -117,65 +466,113 @@ WEBSITE_MAP = {
     "github": "https://github.com",
     "gmail": "https://mail.google.com",
 }
+WEBSITE_KEYS = frozenset(WEBSITE_MAP)
 
-def open_website(site_key: str):
+def _open_url(url: str):
+    """Launch the browser in the background; webbrowser.open blocks on xdg-open/open."""
+    threading.Thread(target=webbrowser.open, args=(url,), daemon=True).start()
+
+async def open_website(site_key: str):
     url = WEBSITE_MAP.get(site_key, None)
     if url:
-        webbrowser.open(url)
+        _open_url(url)
         speak(f"Opening {site_key}.")
     else:
         # try direct open
         if "." in site_key:
-            webbrowser.open("http://" + site_key)
+            _open_url("http://" + site_key)
             speak(f"Opening {site_key}")
         else:
             speak(f"I don't have a direct shortcut for {site_key}. I'll search it on Google.")
-            webbrowser.open("https://www.google.com/search?q=" + quote_plus(site_key))
+            _open_url("https://www.google.com/search?q=" + quote_plus(site_key))
 
-def google_search(query: str):
+async def google_search(query: str):
     if not query:
-        speak("What should I search for?")
-        query = takeCommand()
-    webbrowser.open("https://www.google.com/search?q=" + quote_plus(query))
+        query = await ask("What should I search for?")
+    _open_url("https://www.google.com/search?q=" + quote_plus(query))
     speak(f"Here are the search results for {query}.")
 
 # --- Time & date ---
-def tell_time():
-    now = datetime.datetime.now().strftime("%I:%M %p")
-    speak(f"The time is {now}")
+# Formatted by hand rather than via strftime, which consults the locale.
+_MONTHS = ("January", "February", "March", "April", "May", "June", "July",
+           "August", "September", "October", "November", "December")
+
+async def tell_time():
+    now = datetime.datetime.now()
+    h12 = now.hour % 12 or 12
+    ampm = "AM" if now.hour < 12 else "PM"
+    speak(f"The time is {h12}:{now.minute:02d} {ampm}")
 
-def tell_date():
-    today = datetime.date.today().strftime("%B %d, %Y")
-    speak(f"Today's date is {today}")
+async def tell_date():
+    d = datetime.date.today()
+    speak(f"Today's date is {_MONTHS[d.month - 1]} {d.day}, {d.year}")
 
 # --- Notes ---
-NOTES_FILE = "notes.json"
+NOTES_FILE = "notes.jsonl"  # one JSON object per line, append-only
+LEGACY_NOTES_FILE = "notes.json"  # JSON array written by older versions
 
-def write_note():
-    speak("What should I write in the note?")
-    content = takeCommand()
+def _migrate_legacy_notes():
+    """Move notes from the old notes.json array to the front of NOTES_FILE, once."""
+    if not os.path.exists(LEGACY_NOTES_FILE):
+        return
+    try:
+        with open(LEGACY_NOTES_FILE, "rb") as f:
+            legacy = orjson.loads(f.read())
+    except (OSError, ValueError):
+        return  # leave an unreadable file alone rather than lose it
+    if not isinstance(legacy, list):
+        return
+    existing = b""
+    if os.path.exists(NOTES_FILE):
+        with open(NOTES_FILE, "rb") as f:
+            existing = f.read()
+    tmp = NOTES_FILE + ".tmp"
+    with open(tmp, "wb") as f:
+        for note in legacy:
+            f.write(orjson.dumps(note, option=orjson.OPT_APPEND_NEWLINE))
+        f.write(existing)
+    os.replace(tmp, NOTES_FILE)
+    os.replace(LEGACY_NOTES_FILE, LEGACY_NOTES_FILE + ".migrated")
+
+def load_notes():
+    """Yield saved notes one record at a time, skipping unreadable lines."""
+    _migrate_legacy_notes()
+    if not os.path.exists(NOTES_FILE):
+        return
+    with open(NOTES_FILE, "rb") as f:
+        for line in f:
+            try:
+                yield orjson.loads(line)
+            except ValueError:
+                continue
+
+def _append_note_sync(data: bytes):
+    with open(NOTES_FILE, "ab") as f:
+        f.write(data)
+
+async def _append_note(data: bytes):
+    """Append to NOTES_FILE without blocking the event loop."""
+    await asyncio.to_thread(_migrate_legacy_notes)
+    if aiofiles is not None:
+        async with aiofiles.open(NOTES_FILE, "ab") as f:
+            await f.write(data)
+    else:
+        await asyncio.to_thread(_append_note_sync, data)
+
+async def write_note():
+    content = await ask("What should I write in the note?")
     if not content:
-        speak("No content provided; note canceled.")
+        speak_cached("No content provided; note canceled.")
         return
     note = {"time": datetime.datetime.now().isoformat(), "content": content}
-    notes = []
-    if os.path.exists(NOTES_FILE):
-        try:
-            with open(NOTES_FILE, "r", encoding="utf-8") as f:
-                notes = json.load(f)
-        except Exception:
-            notes = []
-    notes.append(note)
-    with open(NOTES_FILE, "w", encoding="utf-8") as f:
-        json.dump(notes, f, indent=2)
-    speak("Note saved.")
+    await _append_note(orjson.dumps(note, option=orjson.OPT_APPEND_NEWLINE))
+    speak_cached("Note saved.")
     # optionally open notes file
-    speak("Do you want me to open the notes file? Say yes or no.")
-    ans = takeCommand().lower()
+    ans = (await ask("Do you want me to open the notes file? Say yes or no.")).lower()
     if "yes" in ans:
-        open_file(NOTES_FILE)
+        await open_file(NOTES_FILE)
 
-def open_file(path):
+async def open_file(path):
     try:
         system = platform.system()
         if system == "Windows":
@@ -188,81 +585,222 @@ def open_file(path):
         speak("Unable to open file. " + str(e))
 
 # --- Reminders (simple minutes-based reminder) ---
-def set_reminder():
-    speak("What should I remind you about?")
-    message = takeCommand()
+REMINDERS_FILE = "reminders.json"
+
+# Min-heap of (fire_time, message) served by the single reminder_loop() task;
+# mirrored to REMINDERS_FILE so pending reminders survive a restart.
+_REMINDERS = []
+_reminders_lock = None     # asyncio.Lock, created in main()
+_reminders_changed = None  # asyncio.Event, created in main()
+
+def _load_reminders():
+    if not os.path.exists(REMINDERS_FILE):
+        return []
+    try:
+        with open(REMINDERS_FILE, "rb") as f:
+            heap = [(float(when), str(message)) for when, message in orjson.loads(f.read())]
+    except (OSError, ValueError, TypeError):
+        return []
+    heapq.heapify(heap)
+    return heap
+
+def _write_reminders(snapshot):
+    # write-then-rename so a crash mid-write never truncates the saved heap
+    tmp = REMINDERS_FILE + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(orjson.dumps(snapshot))
+    os.replace(tmp, REMINDERS_FILE)
+
+async def _save_reminders():
+    """Persist the heap off the event loop; call with _reminders_lock held."""
+    try:
+        await asyncio.to_thread(_write_reminders, list(_REMINDERS))
+    except OSError as e:
+        # reminders keep firing from memory; only persistence is lost
+        print("Reminder save error:", str(e))
+        speak("I couldn't save reminders to disk. They will be lost if I restart.")
+
+async def add_reminder(fire_time: float, message: str):
+    async with _reminders_lock:
+        heapq.heappush(_REMINDERS, (fire_time, message))
+        await _save_reminders()
+    _reminders_changed.set()
+
+async def reminder_loop():
+    """Speak reminders as they come due, sleeping until the earliest one."""
+    async with _reminders_lock:
+        _REMINDERS[:] = _load_reminders()
+    while True:
+        async with _reminders_lock:
+            _reminders_changed.clear()
+            now = time.time()
+            due = []
+            while _REMINDERS and _REMINDERS[0][0] <= now:
+                due.append(heapq.heappop(_REMINDERS))
+            if due:
+                await _save_reminders()
+            delay = _REMINDERS[0][0] - now if _REMINDERS else None
+        if due:
+            for _, message in due:
+                speak(f"Reminder: {message}")
+            continue
+        try:
+            await asyncio.wait_for(_reminders_changed.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+
+_MIN_RE = re.compile(r"(\d+)")
+
+def _parse_minutes(text: str):
+    """Return the number of minutes in text ("10", "ten", "half an hour"), or None."""
+    m = _MIN_RE.search(text)
+    if m:
+        return int(m.group(1))
+    if "half an hour" in text:
+        return 30
+    if w2n is not None:
+        try:
+            return w2n.word_to_num(text)
+        except ValueError:
+            pass
+    return None
+
+async def set_reminder():
+    message = await ask("What should I remind you about?")
     if not message:
-        speak("No message provided. Reminder canceled.")
+        speak_cached("No message provided. Reminder canceled.")
         return
-    speak("In how many minutes should I remind you?")
-    mins_text = takeCommand()
-    # try to parse integer minutes
-    minutes = None
-    for token in mins_text.split():
-        try:
-            minutes = int(token)
-            break
-        except:
-            continue
+    mins_text = await ask("In how many minutes should I remind you?")
+    minutes = _parse_minutes(mins_text.lower())
     if minutes is None:
-        speak("I couldn't parse the time in minutes. Reminder canceled.")
+        speak_cached("I couldn't parse the time in minutes. Reminder canceled.")
         return
-    def _reminder():
-        speak(f"Reminder: {message}")
-    t = threading.Timer(minutes * 60, _reminder)
-    t.daemon = True
-    t.start()
+    await add_reminder(time.time() + minutes * 60, message)
     speak(f"Okay, I will remind you in {minutes} minutes.")
 
 # --- Take photo (optional) ---
-def take_photo():
+@functools.cache
+def _get_cv2():
+    """Import OpenCV on first use; None if it is not installed."""
+    try:
+        import cv2
+    except Exception:
+        return None
+    return cv2
+
+# Opened on first use and kept open between photos taken close together:
+# re-opening the device costs a camera warm-up (auto-exposure, white balance)
+# and often yields a black first frame. Released after CAM_IDLE_TIMEOUT so the
+# camera (and its LED) does not stay on for the life of the process.
+CAM_IDLE_TIMEOUT = 60  # seconds
+_CAM_FLUSH_GRABS = 4   # fallback when the backend won't report its buffer count
+_CAM = None
+_cam_flush_grabs = _CAM_FLUSH_GRABS
+_cam_release = None    # asyncio.TimerHandle for the pending idle release
+
+def _get_cam():
+    global _CAM, _cam_flush_grabs
+    if _CAM is None or not _CAM.isOpened():
+        cv2 = _get_cv2()
+        system = platform.system()
+        if system == "Linux":
+            cam = cv2.VideoCapture(0, cv2.CAP_V4L2)
+        elif system == "Windows":
+            cam = cv2.VideoCapture(0, cv2.CAP_DSHOW)
+        else:
+            cam = cv2.VideoCapture(0)
+        if not cam.isOpened():
+            return None
+        # ask for a one-frame buffer; not every backend honours (or reports)
+        # this, so size the pre-photo flush from what it says it is using
+        cam.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        reported = int(cam.get(cv2.CAP_PROP_BUFFERSIZE))
+        _cam_flush_grabs = reported if reported > 0 else _CAM_FLUSH_GRABS
+        for _ in range(2):  # discard warm-up frames
+            cam.read()
+        _CAM = cam
+    return _CAM
+
+def _release_cam():
+    global _CAM
+    if _CAM is not None:
+        _CAM.release()
+        _CAM = None
+
+def _read_fresh_frame(cam):
+    # frames buffered since the last photo can be minutes old; skip past them
+    for _ in range(_cam_flush_grabs):
+        cam.grab()
+    return cam.read()
+
+atexit.register(_release_cam)
+
+async def take_photo():
+    cv2 = _get_cv2()
     if cv2 is None:
         speak("OpenCV is not installed. Install opencv-python to use the camera.")
         return
-    cam = cv2.VideoCapture(0)
-    if not cam.isOpened():
+    global _cam_release
+    if _cam_release is not None:
+        _cam_release.cancel()
+        _cam_release = None
+    cam = await asyncio.to_thread(_get_cam)
+    if cam is None:
         speak("Could not access the camera.")
         return
-    ret, frame = cam.read()
+    ret, frame = await asyncio.to_thread(_read_fresh_frame, cam)
+    _cam_release = asyncio.get_running_loop().call_later(CAM_IDLE_TIMEOUT, _release_cam)
     if ret:
         fname = f"photo_{int(time.time())}.png"
         cv2.imwrite(fname, frame)
         speak(f"Photo taken and saved as {fname}")
-        open_file(fname)
+        await open_file(fname)
     else:
         speak("Failed to capture photo.")
-    cam.release()
 
 # --- System commands (safe) ---
-def shutdown_system():
-    speak("Do you really want to shutdown the computer? Say 'yes' to confirm.")
-    ans = takeCommand().lower()
+# argv lists run directly (no shell). On Linux systemctl goes through
+# PolicyKit, so the desktop user needs no sudo password.
+SHUTDOWN_COMMANDS = {
+    "Windows": ["shutdown", "/s", "/t", "5"],
+    "Linux": ["systemctl", "poweroff"],
+    "Darwin": ["osascript", "-e", 'tell app "System Events" to shut down'],
+}
+RESTART_COMMANDS = {
+    "Windows": ["shutdown", "/r", "/t", "5"],
+    "Linux": ["systemctl", "reboot"],
+    "Darwin": ["osascript", "-e", 'tell app "System Events" to restart'],
+}
+
+async def _run_system_command(commands):
+    argv = commands.get(platform.system())
+    if argv is None:
+        return
+    try:
+        subprocess.Popen(argv)
+    except OSError as e:
+        speak("Unable to run the system command. " + str(e))
+
+async def shutdown_system():
+    ans = (await ask("Do you really want to shutdown the computer? Say 'yes' to confirm.",
+                     timeout=CONFIRM_TIMEOUT)).lower()
     if "yes" in ans or "confirm" in ans:
-        system = platform.system()
-        speak("Shutting down...")
-        if system == "Windows":
-            os.system("shutdown /s /t 5")
-        elif system in ("Linux", "Darwin"):
-            # For Linux/macOS this may prompt for password
-            os.system("sudo shutdown now")
+        await speak_sync("Shutting down...")
+        await _run_system_command(SHUTDOWN_COMMANDS)
     else:
-        speak("Shutdown canceled.")
+        speak_cached("Shutdown canceled.")
 
-def restart_system():
-    speak("Do you really want to restart the computer? Say 'yes' to confirm.")
-    ans = takeCommand().lower()
+async def restart_system():
+    ans = (await ask("Do you really want to restart the computer? Say 'yes' to confirm.",
+                     timeout=CONFIRM_TIMEOUT)).lower()
     if "yes" in ans or "confirm" in ans:
-        system = platform.system()
-        speak("Restarting...")
-        if system == "Windows":
-            os.system("shutdown /r /t 5")
-        elif system in ("Linux","Darwin"):
-            os.system("sudo reboot")
+        await speak_sync("Restarting...")
+        await _run_system_command(RESTART_COMMANDS)
     else:
-        speak("Restart canceled.")
+        speak_cached("Restart canceled.")
 
 # --- Small talk & helper ---
-def small_talk(command: str):
+async def small_talk(command: str):
     if "how are you" in command:
         speak("I am a program, but I'm functioning correctly. How can I help you?")
     elif "your name" in command or "who are you" in command:
@@ -271,101 +809,97 @@ def small_talk(command: str):
         speak("Sorry, I didn't understand that. I can open websites, search Google, fetch Wikipedia, set reminders, write notes, and run system commands.")
 
 # --- Main command processor ---
-def process_command(command: str):
+async def _exit_handler(m):
+    await speak_sync("Goodbye. Have a nice day!", cached=True)
+    raise SystemExit
+
+async def _wiki_handler(m):
+    topic = " ".join(part for part in m.group("before", "after") if part)
+    await search_wikipedia(topic, sentences=2)
+
+async def _wiki_question_handler(m):
+    await search_wikipedia(m.group("topic"), sentences=2)
+
+async def _open_handler(m):
+    # "open youtube please" should still hit the shortcut
+    target = " ".join(w for w in m.group("target").split() if w != "please")
+    await open_website(target)
+
+async def _search_handler(m):
+    await google_search(m.group("query").strip())
+
+# (pattern, handler) pairs compiled once at import; the first match wins, so
+# order matters exactly as it did in the old if/elif chain.
+PATTERNS = [
+    (re.compile(r"\b(?:exit|quit|goodbye|stop|bye)\b"), _exit_handler),
+    (re.compile(r"^(?P<before>.*?)\s*\bwikipedia\b\s*(?P<after>.*)$"), _wiki_handler),
+    (re.compile(r"^open (?P<target>.+)"), _open_handler),
+    (re.compile(r"(?:\bsearch for\b|^search\b)\s*(?P<query>.*)"), _search_handler),
+    (re.compile(r"\bgoogle (?P<query>.*)"), _search_handler),
+    (re.compile(r"\btime\b"), lambda m: tell_time()),
+    (re.compile(r"\bdate\b"), lambda m: tell_date()),
+    (re.compile(r"\bnote"), lambda m: write_note()),
+    (re.compile(r"remind me|set reminder"), lambda m: set_reminder()),
+    (re.compile(r"(?:take|capture) (?:a )?photo"), lambda m: take_photo()),
+    (re.compile(r"^(?:who is|what is|tell me about) (?P<topic>.*)"), _wiki_question_handler),
+    (re.compile(r"\bshut ?down\b"), lambda m: shutdown_system()),
+    (re.compile(r"restart|reboot"), lambda m: restart_system()),
+]
+
+async def process_command(command: str):
     cmd = command.lower()
 
     if cmd == "":
         return
 
-    # Exit
-    if any(x in cmd for x in ["exit", "quit", "goodbye", "stop", "bye"]):
-        speak("Goodbye. Have a nice day!")
-        raise SystemExit
-
-    # Wikipedia
-    if "wikipedia" in cmd:
-        topic = cmd.replace("wikipedia", "").strip()
-        search_wikipedia(topic, sentences=2)
-        return
-
-    # Open sites
-    if cmd.startswith("open "):
-        target = cmd.replace("open ", "").strip()
-        open_website(target)
-        return
-
-    # Google search
-    if "search for" in cmd or cmd.startswith("search "):
-        # normalize
-        q = cmd.replace("search for", "").replace("search", "").strip()
-        google_search(q)
-        return
-    if "google " in cmd:
-        q = cmd.replace("google", "").strip()
-        google_search(q)
-        return
-
-    # Time & Date
-    if "time" in cmd:
-        tell_time()
-        return
-    if "date" in cmd:
-        tell_date()
-        return
-
-    # Notes & reminders
-    if "write a note" in cmd or "take note" in cmd or "note" in cmd:
-        write_note()
-        return
-    if "remind me" in cmd or "set reminder" in cmd:
-        set_reminder()
-        return
-
-    # Take photo
-    if "take a photo" in cmd or "take photo" in cmd or "capture photo" in cmd:
-        take_photo()
-        return
-
-    # Wikipedia alternative phrasing: "who is ..." "what is ..."
-    if cmd.startswith("who is ") or cmd.startswith("what is ") or cmd.startswith("tell me about "):
-        topic = cmd.replace("who is", "").replace("what is", "").replace("tell me about", "").strip()
-        search_wikipedia(topic, sentences=2)
-        return
-
-    # System commands
-    if "shutdown" in cmd:
-        shutdown_system()
-        return
-    if "restart" in cmd or "reboot" in cmd:
-        restart_system()
-        return
+    for pattern, handler in PATTERNS:
+        m = pattern.search(cmd)
+        if m:
+            await handler(m)
+            return
 
-    # Open common shortcuts
-    for key in WEBSITE_MAP.keys():
-        if key in cmd and "open" in cmd:
-            open_website(key)
+    # Open common shortcuts ("please open youtube")
+    toks = cmd.split()
+    if "open" in toks:
+        key = next((t for t in toks if t in WEBSITE_KEYS), None)
+        if key:
+            await open_website(key)
             return
 
     # small talk fallback
-    small_talk(cmd)
+    await small_talk(cmd)
 
 # --- Entry point ---
-def main():
-    wishMe()
+async def main():
+    # asyncio primitives are created here rather than at import: before
+    # Python 3.10 they bind to the loop current at creation, which is not the
+    # one asyncio.run() starts.
+    global utterances, _reminders_lock, _reminders_changed
+    utterances = asyncio.Queue()
+    _reminders_lock = asyncio.Lock()
+    _reminders_changed = asyncio.Event()
+    _SAY_Q.put((prewarm_tts_cache, None))  # on the speaker thread, before the greeting
+    await wishMe()
+    listener = asyncio.create_task(listen_loop())
+    reminders = asyncio.create_task(reminder_loop())
     try:
         while True:
-            speak("Listening for your command.")
-            query = takeCommand()
+            speak_cached("Listening for your command.")
+            query = await takeCommand()
             if not query:
                 continue
             try:
-                process_command(query)
+                await process_command(query)
             except SystemExit:
                 break
             # tiny idle sleep
-            time.sleep(0.5)
-    except KeyboardInterrupt:
-        speak("Assistant terminated by user. Bye!")
+            await asyncio.sleep(0.5)
+    finally:
+        listener.cancel()
+        reminders.cancel()
 
 if __name__ == "__main__":
-    main()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        asyncio.run(speak_sync("Assistant terminated by user. Bye!"))